@@ -1,16 +1,93 @@
 import sqlite3     # For SQLite database interaction
+import contextlib  # For building context managers
 import requests    # For making HTTP requests
+from requests.adapters import HTTPAdapter  # For pooling HTTP connections
+from urllib3.util.retry import Retry       # For retrying failed connections
 import json        # For handling JSON data
 import os          # For interacting with the operating system
+import sys         # For writing directly to standard output
 import time        # For time-related functionality
 import webbrowser  # For opening web browser from the script
 import datetime    # For date and time-related functionality
-from typing import List, Dict, Union, Tuple  # For type hinting
+import urllib.parse  # For encoding URL query strings
+from typing import List, Dict, Union, Tuple, Optional  # For type hinting
 
 # Typing
 KeyType = Dict[str, str]  # Data Type for API Key, dictionary where both keys and values are strings.
 DataType = List[Dict[str, Union[str, int]]]  # Data Type for retrieved data, type is a list of dictionaries
                                              # with string keys and values that can be either strings or integers.
+
+# SQL statements used on hot paths, kept as constants so sqlite3's statement cache always reuses the prepared statement.
+SQL_ADD_SAVE = 'INSERT OR IGNORE INTO SavedExercises (ExerciseName, ExerciseDetails) VALUES (?, ?)'
+SQL_DELETE_SAVE = 'DELETE FROM SavedExercises WHERE ExerciseName = ? RETURNING 1'
+SQL_SET_GOAL = 'UPDATE DailyCalories SET Goal = ? WHERE Date = ?'
+SQL_TRACK_CALORIES = 'UPDATE DailyCalories SET Consumed = Consumed + ? WHERE Date = ? RETURNING Consumed'
+SQL_GET_CONSUMED = 'SELECT Consumed FROM DailyCalories WHERE Date = ?'
+
+# How long cached API responses stay fresh, in seconds, per mode.
+CACHE_TTL = {
+    'exercise': 24 * 60 * 60,      # 24 hours
+    'nutrition': 7 * 24 * 60 * 60  # 7 days
+}
+# How long a verified API key is trusted before it is checked against the API again, in seconds.
+KEY_VERIFY_TTL = 24 * 60 * 60
+
+# Display templates, filled in with str.format_map and written in a single call.
+EXERCISE_TEMPLATE = (
+    "\nLet's dive into this exercise!\n"
+    "Exercise Name: {name}\n"
+    "Type: {type}\n"
+    "Muscle: {muscle}\n"
+    "Equipment: {equipment}\n"
+    "Difficulty: {difficulty}\n"
+    "Instructions: {instructions}\n"
+)
+NUTRITION_TEMPLATE = (
+    "\nNutrition Information:\n"
+    "Name: {name}\n"
+    "Calories: {calories}\n"
+    "Serving Size: {serving_size_g}g\n"
+    "Total Fat: {fat_total_g}g\n"
+    "Saturated Fat: {fat_saturated_g}g\n"
+    "Protein: {protein_g}g\n"
+    "Sodium: {sodium_mg}mg\n"
+    "Potassium: {potassium_mg}mg\n"
+    "Cholesterol: {cholesterol_mg}mg\n"
+    "Total Carbohydrates: {carbohydrates_total_g}g\n"
+    "Fiber: {fiber_g}g\n"
+    "Sugar: {sugar_g}g\n"
+)
+
+# Nutritional advice messages, joined together by Pagination.nutritional_advice.
+ADVICE_LOW_CALORIE = "Low-calorie: Suitable for a healthy diet. Consider incorporating a variety of nutrient-dense foods."
+ADVICE_MODERATE_BALANCED = "Moderate-calorie: Balanced nutritional content. Enjoy in moderation as part of a well-rounded diet."
+ADVICE_MODERATE_UNBALANCED = "Moderate-calorie: Consider optimizing your nutritional balance."
+ADVICE_LOW_FAT = " Increase healthy fats for sustained energy."
+ADVICE_HIGH_FAT = " Limit saturated fats for heart health."
+ADVICE_LOW_PROTEIN = " Include more protein sources for muscle maintenance."
+ADVICE_HIGH_SUGAR = " Be mindful of added sugars for overall well-being."
+ADVICE_HIGH_CALORIE = "High-calorie: Consider consuming in moderation. Check nutritional values for a balanced and varied diet."
+ADVICE_MINDFUL = "\nBe mindful of {}. Small amount occasionally can be okay, but try to focus on a balanced diet overall."
+
+class DefaultingDict(dict):
+    '''Dictionary that returns an empty string for missing keys, so a template with an absent field still renders.'''
+    def __missing__(self, key: str) -> str:
+        return ''
+
+def json_row(cursor: sqlite3.Cursor, row: Tuple[str]) -> Dict[str, Union[str, int]]:
+    '''SQLite row factory that decodes a row's single JSON column into a dictionary.'''
+    return json.loads(row[0])
+
+def pause(seconds: float) -> None:
+    '''
+    Sleeps for the given time to pace interactive output, skipping the wait when output isn't a terminal or SMOKI_FAST=1 is set.
+
+    Args:
+    - seconds (float): How long to pause for.
+    '''
+    if sys.stdout.isatty() and os.environ.get('SMOKI_FAST') != '1':
+        time.sleep(seconds)
+
 class Trainer:
     '''
     SmokiFit Guide - Your Personal Fitness Companion.
@@ -22,34 +99,53 @@ class Trainer:
     - type: Exercise type for search.
     - muscle: Muscle targeted for exercise search.
     - name: Name of the exercise for named search.
-    - food: Name of the food for nutrition search.
+    - food: Names of the foods for nutrition search, fetched together in a single request.
     - mode: Current mode of operation (exercise/nutrition).
     - key: API key used for making requests.
+    - config: Settings parsed from the config file, loaded once per session.
+    - session: HTTP session reusing connections to the API across requests.
+    - user_data: UserData object whose database holds the API response cache.
     '''
-    def __init__(self):
-        '''Initialize the Trainer class with default values.'''
+    def __init__(self, user_data: 'UserData'):
+        '''
+        Initialize the Trainer class with default values.
+
+        Args:
+        - user_data (UserData): The UserData object used for caching API responses.
+        '''
+        self.user_data = user_data
         self.difficulty = ''
         self.type = ''
         self.muscle = ''
         self.name = ''
-        self.food = ''
+        self.food: List[str] = []
         self.mode = ''
+        self.config: Dict[str, Union[str, int]] = {}
+        # A single session keeps the connection to the API alive, avoiding a new TLS handshake on every request.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=Retry(total=2, backoff_factor=0.2)))
         self.key: KeyType = self.load_key()
+        if self.key:
+            self.session.headers.update(self.key)
 
     def load_key(self) -> KeyType:
         '''Checks if a config file exists, loads the API key from it, verifies its validity, or prompts the user for a new key if needed.'''
         if os.path.exists('config.txt'):
             with open('config.txt', 'r') as config_file:
-                data = json.load(config_file)
-                key = data.get('key', '')
+                self.config = json.load(config_file)
+            key = self.config.get('key', '')
+            # Trust a recently verified key and reuse its joke, skipping the network round-trip on start-up.
+            if key and time.time() - self.config.get('last_verified_ts', 0) < KEY_VERIFY_TTL:
+                print("Lighten up your mood buddy.", self.config.get('joke', ''))
+                return {'X-Api-Key': key}
             verify = self.verify_key(key)
             if verify[0]:
                 print("Lighten up your mood buddy.", verify[1])
+                self.mark_verified(verify[1])
+                self.save_config()
                 return {'X-Api-Key': key}
             else:
-                print("Your API key has expired. Please set a valid key.")
-                print("Free API key at \033[4mhttps://api-ninjas.com\033[0m.")
-                return self.ask_for_key()
+                return self.reask_for_key()
         else:
             self.introduction()
             return self.ask_for_key()
@@ -57,12 +153,12 @@ class Trainer:
     def introduction(self) -> None:
         '''Displays a welcoming introduction and instructions to the user.'''
         print("Welcome to SmokiFit Guide - Your Personal Fitness Companion!")
-        # sleep() is used to simulate loading
-        time.sleep(1)
+        # pause() is used to simulate loading
+        pause(1)
         print("\nHello there! I'm Smoki, your virtual fitness trainer. Whether you're looking for tailored exercises or nutritional information, I'm here to guide you on your wellness journey. Before we dive in, let me give you a quick overview and some instructions.")
-        time.sleep(2)
+        pause(2)
         print("\nSmokiFit Guide allows you to explore a variety of exercises and nutrition facts. You can search for exercises based on difficulty, type, and muscle, or discover nutritional details for different foods.")
-        time.sleep(2)
+        pause(2)
         input("\nBefore we begin, you'll need to provide an API key. Don't worry; it's easy! Visit \033[4mhttps://api-ninjas.com\033[0m to get your free API key. Once you have it, enter it below, and I will remember it for future sessions. Press enter to get redirected to website.")
         # Open the website in default browser from the console.
         webbrowser.open("https://api-ninjas.com")
@@ -75,13 +171,21 @@ class Trainer:
                 break
             verify = self.verify_key(key)
             if verify[0]:
+                self.mark_verified(verify[1])
                 self.save_key(key)
+                self.session.headers['X-Api-Key'] = key
                 print("\nAPI key has been set.")
                 print("\nWanna listen to a joke?", verify[1])
                 return {'X-Api-Key': key}
             else:
                 print("Invalid API key. Please try again.")
     
+    def reask_for_key(self) -> KeyType:
+        '''Tells the user the saved API key has expired, then asks for a new one and returns it.'''
+        print("Your API key has expired. Please set a valid key.")
+        print("Free API key at \033[4mhttps://api-ninjas.com\033[0m.")
+        return self.ask_for_key()
+    
     def verify_key(self, key: str) -> Tuple[bool, str]:
         '''
         Checks if the provided API key is valid by making a request to the API.
@@ -93,12 +197,27 @@ class Trainer:
         - tuple: A tuple containing a boolean indicating verification status and a joke if valid.
         '''
         headers = {'X-Api-Key': key}
-        response = requests.get('https://api.api-ninjas.com/v1/dadjokes?limit=1', headers=headers)
+        # This is also reached from the menus, outside the start-up handler, and a timed-out request raises rather than returning.
+        try:
+            response = self.session.get('https://api.api-ninjas.com/v1/dadjokes?limit=1', headers=headers, timeout=5)
+        except requests.exceptions.RequestException:
+            print("Please make sure you have an active internet connection.")
+            return (False,)
         if response.status_code == requests.codes.ok:
-            return (True, json.loads(response.text)[0]['joke'])
+            return (True, response.json()[0]['joke'])
         else:
             return (False,)
     
+    def mark_verified(self, joke: str) -> None:
+        '''
+        Records in the settings that the API key has just been verified.
+
+        Args:
+        - joke (str): Joke returned by the verification request, shown again on warm starts.
+        '''
+        self.config['last_verified_ts'] = int(time.time())
+        self.config['joke'] = joke
+
     def save_key(self, key: str) -> None:
         '''
         Stores the API key in a configuration file for future sessions.
@@ -106,35 +225,80 @@ class Trainer:
         Arg:
         - key (str): API key to be saved.
         '''
-        data = {'key': key}
-        with open('config.txt', 'w') as config_file:
-            json.dump(data, config_file)
+        self.config['key'] = key
+        self.save_config()
+
+    def save_config(self) -> None:
+        '''Writes the settings to the configuration file, replacing it atomically so it is never left half-written.'''
+        with open('config.txt.tmp', 'w') as config_file:
+            json.dump(self.config, config_file)
+        os.replace('config.txt.tmp', 'config.txt')
 
-    def get_data(self) -> str:
+    def get_data(self) -> Optional[DataType]:
         '''
-        Makes a request to the API to retrieve data based on the current mode and parameters.
+        Retrieves data based on the current mode and parameters, from the local cache if a fresh copy exists, otherwise by making a request to the API.
 
         Returns:
-        - str: Response text from the API.
+        - list: List of dictionaries parsed from the API response, or None if the request failed.
         '''
         if self.mode == 'exercise':
-            api_url = 'https://api.api-ninjas.com/v1/exercises?difficulty={0}&type={1}&muscle={2}&name={3}'.format(self.difficulty, self.type, self.muscle, self.name)
+            # Leave out empty parameters, which keeps the URL short and the cache key canonical.
+            params = {k: v for k, v in (('difficulty', self.difficulty), ('type', self.type), ('muscle', self.muscle), ('name', self.name)) if v}
+            api_url = 'https://api.api-ninjas.com/v1/exercises?' + urllib.parse.urlencode(params)
         elif self.mode == 'nutrition':
-            api_url = 'https://api.api-ninjas.com/v1/nutrition?query={}'.format(self.food)
+            # The API accepts several foods joined by 'and', so all of them are fetched in one round-trip.
+            api_url = 'https://api.api-ninjas.com/v1/nutrition?' + urllib.parse.urlencode({'query': ' and '.join(self.food)})
+        # Normalize the cache key so identical queries share one cache entry, while sending the URL as built.
+        cache_key = api_url.lower()
         
-        response = requests.get(api_url, headers=self.key)
+        # The URL now holds the whole search, so clear the parameters before anything can fail and leak them into the next search.
+        self.difficulty = self.type = self.muscle = self.name = ''
+        self.food = []
         
-        if response.status_code == requests.codes.ok:
-            self.difficulty = self.type = self.muscle = self.name = self.food = ''
-            return response.text
-        else:
-            print("Error:", response.status_code, response.text)
+        # Skip the network round-trip if the same query was answered recently.
+        cached = self.user_data.get_cached_response(cache_key, CACHE_TTL[self.mode])
+        if cached is not None:
+            return json.loads(cached)
+        
+        while True:
+            # The key check at start-up may have been skipped, so this can be the first request to hit a dead connection.
+            try:
+                response = self.session.get(api_url, timeout=5)
+            except requests.exceptions.RequestException:
+                print("Please make sure you have an active internet connection.")
+                return None
+            
+            if response.status_code == requests.codes.ok:
+                self.user_data.cache_response(cache_key, response.text)
+                return response.json()
+            elif response.status_code in (requests.codes.unauthorized, requests.codes.forbidden):
+                # The key may have expired since it was last verified, so force a check next start and ask for a new one.
+                self.config['last_verified_ts'] = 0
+                self.save_config()
+                key = self.reask_for_key()
+                if not key:
+                    return None
+                # Retry the same request with the new key.
+                self.key = key
+            else:
+                print("Error:", response.status_code, response.text)
+                return None
 
 class UserData:
     def __init__(self):
-        '''Initialize the UserData object, connecting to the SQLite database, creating necessary tables, and initializing the user\'s daily calories intake goal.'''
-        self.conn = sqlite3.connect(f'user_data.db')
+        '''Initialize the UserData object, connecting to the SQLite database and creating necessary tables.'''
+        # In autocommit mode each statement commits on its own, and related writes are grouped explicitly with transaction().
+        self.conn = sqlite3.connect(f'user_data.db', isolation_level=None)
         self.cursor = self.conn.cursor()
+        # Separate cursor for reading stored JSON, so its row factory doesn't affect other queries.
+        self.json_cursor = self.conn.cursor()
+        self.json_cursor.row_factory = json_row
+        # WAL with synchronous=NORMAL avoids an fsync on every commit, the slowest part of each write.
+        self.cursor.execute('PRAGMA journal_mode=WAL')
+        self.cursor.execute('PRAGMA synchronous=NORMAL')
+        self.cursor.execute('PRAGMA temp_store=MEMORY')
+        self.cursor.execute('PRAGMA cache_size=-4096')     # 4 MiB page cache
+        self.cursor.execute('PRAGMA mmap_size=67108864')   # 64 MiB memory-mapped I/O
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS SavedExercises (
                 ExerciseName TEXT PRIMARY KEY,
@@ -146,25 +310,61 @@ class UserData:
                 FoodDetails TEXT
             )
         ''')
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ApiCache (
+                url TEXT PRIMARY KEY,
+                body TEXT,
+                ts INTEGER
+            )
+        ''')
+        # Names of saved exercises, kept in memory so checking whether one is saved needs no query.
+        self.cursor.execute('SELECT ExerciseName FROM SavedExercises')
+        self.saved_names = {row[0] for row in self.cursor.fetchall()}
+
+    @contextlib.contextmanager
+    def transaction(self, commit_on_interrupt: bool = False):
+        '''
+        Runs the enclosed statements as one transaction, committed once at the end or rolled back on error.
+        SQLite cannot nest transactions, so nothing run inside this block may open another with transaction().
+
+        Args:
+        - commit_on_interrupt (bool): Commit instead of rolling back when the block is left with Ctrl-C.
+        '''
+        self.cursor.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except KeyboardInterrupt:
+            self.cursor.execute('COMMIT' if commit_on_interrupt else 'ROLLBACK')
+            raise
+        except BaseException:
+            self.cursor.execute('ROLLBACK')
+            raise
+        self.cursor.execute('COMMIT')
+
+    def load_goal(self) -> None:
+        '''Initializes the user\'s daily calories intake goal, prompting for one on the first run.'''
+        today = datetime.date.today().isoformat()
         # Try to load the previous day’s goal.
         try:
             self.cursor.execute('SELECT Goal, Date FROM DailyCalories ORDER BY Date DESC')
             data = self.cursor.fetchone()
             self.goal = data[0]
             # Create a record for today if it doesn't exist already.
-            if data[1] != datetime.datetime.now().strftime('%Y-%m-%d'):
-                self.cursor.execute('''
-                    INSERT INTO DailyCalories (Date, Consumed, Goal) VALUES (?, ?, ?)
-                ''', (datetime.datetime.now().strftime('%Y-%m-%d'), 0, self.goal))
-                
-                # Keep only the last 7 days of history to avoid redundancy.
-                self.cursor.execute('''
-                    DELETE FROM DailyCalories 
-                    WHERE Date NOT IN (
-                        SELECT Date FROM DailyCalories ORDER BY Date DESC LIMIT 7
-                    )
-                ''')
-                self.conn.commit()
+            if data[1] != today:
+                # Add today's record and trim the history together.
+                with self.transaction():
+                    self.cursor.execute('''
+                        INSERT INTO DailyCalories (Date, Consumed, Goal) VALUES (?, ?, ?)
+                    ''', (today, 0, self.goal))
+                    
+                    # Keep only the last 7 days of history to avoid redundancy.
+                    # Deleting below the 7th newest date is a single seek on the primary key index.
+                    self.cursor.execute('''
+                        DELETE FROM DailyCalories 
+                        WHERE Date < (
+                            SELECT Date FROM DailyCalories ORDER BY Date DESC LIMIT 1 OFFSET 6
+                        )
+                    ''')
 
         # In the first run, there will be an OperationalError, meaning the table doesn't exist, so create it, prompt the user to set a daily calories intake goal and enter the first record with today's date.
         except sqlite3.OperationalError:
@@ -178,10 +378,43 @@ class UserData:
             goal = int(input("\nEnter your daily calories intake goal: "))
             self.cursor.execute('''
             INSERT INTO DailyCalories (Date, Consumed, Goal) VALUES (?, ?, ?)
-            ''', (datetime.datetime.now().strftime('%Y-%m-%d'), 0, goal))
-            self.conn.commit()
+            ''', (today, 0, goal))
             self.goal = goal
 
+    def get_cached_response(self, url: str, ttl: int) -> Union[str, None]:
+        '''
+        Retrieves a cached API response if it is still fresh.
+
+        Args:
+        - url (str): Normalized request URL used as the cache key.
+        - ttl (int): Maximum age of the cached response in seconds.
+
+        Returns:
+        - str: The cached response text, or None on a miss or if the entry has expired.
+        '''
+        self.cursor.execute('SELECT body, ts FROM ApiCache WHERE url = ?', (url,))
+        row = self.cursor.fetchone()
+        if row and time.time() - row[1] < ttl:
+            return row[0]
+        return None
+
+    def cache_response(self, url: str, body: str) -> None:
+        '''
+        Stores an API response in the cache and removes entries too old to be used by any mode.
+
+        Args:
+        - url (str): Normalized request URL used as the cache key.
+        - body (str): Response text from the API.
+        '''
+        now = int(time.time())
+        with self.transaction():
+            self.cursor.execute('''
+                INSERT OR REPLACE INTO ApiCache (url, body, ts) VALUES (?, ?, ?)
+            ''', (url, body, now))
+
+            # Keep the cache from growing forever, dropping anything older than the longest TTL.
+            self.cursor.execute('DELETE FROM ApiCache WHERE ts < ?', (now - max(CACHE_TTL.values()),))
+
     def config_calories_goal(self, goal: int) -> None:
         '''
         Changes the daily calories intake goal to the provided new goal.
@@ -189,10 +422,8 @@ class UserData:
         Args:
         - goal (int): New daily calories intake goal.
         '''
-        self.cursor.execute('''
-            UPDATE DailyCalories SET Goal = ? WHERE Date = ?
-        ''', (goal, datetime.datetime.now().strftime('%Y-%m-%d')))
-        self.conn.commit()
+        today = datetime.date.today().isoformat()
+        self.cursor.execute(SQL_SET_GOAL, (goal, today))
         self.goal = goal
         
     def track_consumed_calories(self, consumed: float) -> Tuple[bool, float]:
@@ -206,13 +437,12 @@ class UserData:
         Returns:
         - tuple: A tuple containing a boolean indicating goal achievement and the total consumed calories.
         '''
-        today = datetime.datetime.now().strftime('%Y-%m-%d')
-        self.cursor.execute('''
-            UPDATE DailyCalories SET Consumed = Consumed + ? WHERE Date = ?
-        ''', (round(consumed, 1), today))
-        self.conn.commit()
+        today = datetime.date.today().isoformat()
+        # RETURNING hands back the new total, saving a separate SELECT.
+        self.cursor.execute(SQL_TRACK_CALORIES, (round(consumed, 1), today))
+        # Fetch every row so the statement finishes and its change is committed.
+        consumed_calories = round(self.cursor.fetchall()[0][0], 1)
         
-        consumed_calories = self.get_consumed_calories()
         if consumed_calories < self.goal:
             return (True, consumed_calories)
         else:
@@ -225,8 +455,8 @@ class UserData:
         Returns:
         - float: Consumed calories for the current day.
         '''
-        today = datetime.datetime.now().strftime('%Y-%m-%d')
-        self.cursor.execute('SELECT Consumed FROM DailyCalories WHERE Date = ?', (today,))
+        today = datetime.date.today().isoformat()
+        self.cursor.execute(SQL_GET_CONSUMED, (today,))
         consumed = self.cursor.fetchone()
         return round(consumed[0],1)
     
@@ -257,34 +487,38 @@ class UserData:
         Returns:
         - bool: True if the exercise is saved, False otherwise.
         '''
-        self.cursor.execute('SELECT COUNT(*) FROM SavedExercises WHERE ExerciseName = ?', (exercise_name,))
-        count = self.cursor.fetchone()[0]
-        return count > 0
+        return exercise_name in self.saved_names
     
-    def add_save(self, exercise_name: str, details: Dict[str, Union[str, int]]) -> None:
+    def add_save(self, exercise_name: str, details_json: str) -> bool:
         '''
-        Adds or updates a saved exercise.
+        Adds a saved exercise, unless it is already saved.
 
         Args:
         - exercise_name (str): Name of the exercise.
-        - details (dict): Exercise details.
+        - details_json (str): Exercise details, already serialized to JSON.
+
+        Returns:
+        - bool: True if the exercise was newly saved, False if it was already saved.
         '''
-        self.cursor.execute('''
-            INSERT OR REPLACE INTO SavedExercises (ExerciseName, ExerciseDetails) VALUES (?, ?)
-        ''', (exercise_name, json.dumps(details)))
-        self.conn.commit()
+        self.cursor.execute(SQL_ADD_SAVE, (exercise_name, details_json))
+        added = self.cursor.rowcount > 0
+        self.saved_names.add(exercise_name)
+        return added
 
-    def delete_save(self, exercise_name: str) -> None:
+    def delete_save(self, exercise_name: str) -> bool:
         '''
         Deletes a saved exercise.
 
         Args:
         - exercise_name (str): Name of the exercise.
+
+        Returns:
+        - bool: True if the exercise was deleted, False if it was not saved.
         '''
-        self.cursor.execute('''
-            DELETE FROM SavedExercises WHERE ExerciseName = ?
-        ''', (exercise_name,))
-        self.conn.commit()
+        self.cursor.execute(SQL_DELETE_SAVE, (exercise_name,))
+        deleted = bool(self.cursor.fetchall())
+        self.saved_names.discard(exercise_name)
+        return deleted
 
     def get_saves(self) -> DataType:
         '''
@@ -293,18 +527,14 @@ class UserData:
         Returns:
         - list: List of dictionaries containing saved exercises' details.
         '''
-        self.cursor.execute('SELECT ExerciseDetails FROM SavedExercises')
-        retrieved_data_tuples = self.cursor.fetchall()
-        # Convert the list of tuples back to a list of dictionaries.
-        retrieved_data = [json.loads(item[0]) for item in retrieved_data_tuples]
-        return retrieved_data
+        return list(self.json_cursor.execute('SELECT ExerciseDetails FROM SavedExercises'))
     
     def remove_all_saves(self) -> None:
         '''Removes all saved exercises.'''
         confirmation = input("\nAre you sure you want to remove all saved exercises? (y/n): ").lower()
         if confirmation == 'y':
             self.cursor.execute('DELETE FROM SavedExercises')
-            self.conn.commit()
+            self.saved_names.clear()
             print("All saves have been removed.")
         else:
             print("Operation canceled.")
@@ -319,19 +549,18 @@ class UserData:
         # Since food_details is a list of dictionaries, convert them to a list of tuples to insert all data in a batch.
         data_to_store = [(json.dumps(item),) for item in food_details]
 
-        self.cursor.executemany('''
-            INSERT INTO SearchedFoodHistory (FoodDetails) VALUES (?)
-        ''', data_to_store)
+        with self.transaction():
+            self.cursor.executemany('''
+                INSERT INTO SearchedFoodHistory (FoodDetails) VALUES (?)
+            ''', data_to_store)
 
-        # Keep only the latest 10 entries in history
-        self.cursor.execute('''
-            DELETE FROM SearchedFoodHistory 
-            WHERE ROWID NOT IN (
-                SELECT ROWID FROM SearchedFoodHistory ORDER BY ROWID DESC LIMIT 10
-            )
-        ''')
-        
-        self.conn.commit()
+            # Keep only the latest 10 entries in history
+            self.cursor.execute('''
+                DELETE FROM SearchedFoodHistory 
+                WHERE ROWID < (
+                    SELECT ROWID FROM SearchedFoodHistory ORDER BY ROWID DESC LIMIT 1 OFFSET 9
+                )
+            ''')
 
     def get_history(self) -> DataType:
         '''
@@ -340,43 +569,38 @@ class UserData:
         Returns:
         - list: List of dictionaries containing food search history.
         '''
-        self.cursor.execute('SELECT * FROM SearchedFoodHistory ORDER BY ROWID DESC')
-        retrieved_data_tuples = self.cursor.fetchall()
-        # Convert the list of tuples back to a list of dictionaries
-        retrieved_data = [json.loads(item[0]) for item in retrieved_data_tuples]
-        return retrieved_data
+        return list(self.json_cursor.execute('SELECT FoodDetails FROM SearchedFoodHistory ORDER BY ROWID DESC'))
         
     def clear_history(self) -> None:
         '''Clears the food search history.'''
         confirmation = input("\nAre you sure you want to clear the search history? (y/n): ").lower()
         if confirmation == 'y':
             self.cursor.execute('DELETE FROM SearchedFoodHistory')
-            self.conn.commit()
             print("History has been cleared.")
         else:
             print("Operation canceled.")
 
 class Pagination:
-    def __init__(self, user_data: UserData):
+    def __init__(self, user_data: UserData, trainer: Trainer):
         '''
         Initializes the Pagination object, setting the initial page size and preparing for pagination.
 
         Args:
         - user_data (UserData): The UserData object to be used for tracking user-specific data.
+        - trainer (Trainer): The Trainer object holding the loaded settings.
         '''
         self.user_data = user_data
+        self.trainer = trainer
         self.page_size = self.load_page_size()
     
     def load_page_size(self) -> int:
         '''
-        Loads the page size from a configuration file.
+        Loads the page size from the settings already read by the Trainer.
 
         Returns:
         - int: The loaded page size.
         '''
-        with open('config.txt', 'r') as config_file:
-            data = json.load(config_file)
-            return data.get('page_size', 1)
+        return self.trainer.config.get('page_size', 1)
     
     def set_page_size(self) -> None:
         '''
@@ -395,11 +619,8 @@ class Pagination:
                     new_size = int(new_size)
                 if 1 <= new_size <= 3:
                     self.page_size = new_size
-                    with open('config.txt', 'r+') as config_file:
-                        data = json.load(config_file)
-                        data['page_size'] = self.page_size
-                        config_file.seek(0)
-                        json.dump(data, config_file)
+                    self.trainer.config['page_size'] = self.page_size
+                    self.trainer.save_config()
                     print("\nPage size has been configured.")
                     break
                 else:
@@ -409,37 +630,17 @@ class Pagination:
     
     def display_exercise(self) -> None:
         '''Displays exercise details.'''
-        print(f"\nLet's dive into this exercise!")
-        print(f"Exercise Name: {self.display_data['name']}")
-        print(f"Type: {self.display_data['type']}")
-        print(f"Muscle: {self.display_data['muscle']}")
-        print(f"Equipment: {self.display_data['equipment']}")
-        print(f"Difficulty: {self.display_data['difficulty']}")
-        print(f"Instructions: {self.display_data['instructions']}")
+        sys.stdout.write(EXERCISE_TEMPLATE.format_map(DefaultingDict(self.display_data)))
 
     def display_nutrition(self) -> None:
         '''Displays nutrition details.'''
-        print("\nNutrition Information:")
-        print(f"Name: {self.display_data['name']}")
-        print(f"Calories: {self.display_data['calories']}")
-        print(f"Serving Size: {self.display_data['serving_size_g']}g")
-        print(f"Total Fat: {self.display_data['fat_total_g']}g")
-        print(f"Saturated Fat: {self.display_data['fat_saturated_g']}g")
-        print(f"Protein: {self.display_data['protein_g']}g")
-        print(f"Sodium: {self.display_data['sodium_mg']}mg")
-        print(f"Potassium: {self.display_data['potassium_mg']}mg")
-        print(f"Cholesterol: {self.display_data['cholesterol_mg']}mg")
-        print(f"Total Carbohydrates: {self.display_data['carbohydrates_total_g']}g")
-        print(f"Fiber: {self.display_data['fiber_g']}g")
-        print(f"Sugar: {self.display_data['sugar_g']}g")
+        sys.stdout.write(NUTRITION_TEMPLATE.format_map(DefaultingDict(self.display_data)))
     
     def display_page(self) -> None:
         '''Displays current page.'''
         print(f"\nPage {self.current_page}/{self.total_pages}:")
         
-        start_index = (self.current_page - 1) * self.page_size
-        end_index = start_index + self.page_size
-        page_data = self.data[start_index:end_index]
+        page_data = self.pages[self.current_page - 1] if self.pages else []
         # Initialize variables to track cumulative nutrition values for the displayed page.
         self.serving_size_check = True
         self.mindful_food = ''  # Foods to be mindful of.
@@ -457,30 +658,24 @@ class Pagination:
                 if self.mode == 'exercise':
                     self.display_exercise()
                 elif self.mode == 'nutrition':
-                    # Accumulate nutrition values for the displayed page.
-                    serving_size = self.display_data.get('serving_size_g', 100)
-                    factor = 100 / serving_size  # To calculate nutritions per 100g.
-                    calories = self.display_data.get('calories', 0) * factor
-                    # Smart condition checking.
-                    if serving_size >= 100 and self.serving_size_check:
-                        # This block won't get executed after check modifies once.
-                        self.serving_size_check = True
-                    elif not self.serving_size_check:
-                        # Enter block in second food if check was modified.
-                        if serving_size < 100 and calories > 300:
-                            # Write food name to mindful_food if thresholds met.
-                            self.mindful_food += f" and {self.display_data.get('name')}"
-                    else:
-                        # This block will get executed only once when check modifies.
-                        if serving_size < 100 and calories > 300:
-                            self.serving_size_check = False
-                            self.mindful_food += self.display_data.get('name')
-                    
-                    self.page_calories += calories
-                    self.page_fat += self.display_data.get('fat_total_g', 0) * factor
-                    self.page_protein += self.display_data.get('protein_g', 0) * factor
-                    self.page_sugar += self.display_data.get('sugar_g', 0) * factor
                     self.display_nutrition()
+            
+            if self.mode == 'nutrition':
+                # Scale every food's values to per 100g and total them for the displayed page in one pass.
+                mindful = []
+                for data in page_data:
+                    serving_size = data.get('serving_size_g', 100)
+                    factor = 100 / serving_size
+                    calories = data.get('calories', 0) * factor
+                    self.page_calories += calories
+                    self.page_fat += data.get('fat_total_g', 0) * factor
+                    self.page_protein += data.get('protein_g', 0) * factor
+                    self.page_sugar += data.get('sugar_g', 0) * factor
+                    # Foods to be mindful of: small servings that are still calorie-dense.
+                    if serving_size < 100 and calories > 300:
+                        mindful.append(data.get('name'))
+                self.mindful_food = ' and '.join(mindful)
+                self.serving_size_check = not mindful
     
     def nutritional_advice(self) -> str:
         '''
@@ -489,30 +684,30 @@ class Pagination:
         Returns:
         - str: Nutritional advice based on the optimised calculations.
         '''
-        advice = ''
+        parts = []
         if self.page_calories < 100:
-            advice += "Low-calorie: Suitable for a healthy diet. Consider incorporating a variety of nutrient-dense foods."
+            parts.append(ADVICE_LOW_CALORIE)
         elif 100 <= self.page_calories <= 300:
             if 10 <= self.page_fat <= 20 and 5 <= self.page_protein <= 20 and self.page_sugar <= 10:
-                advice += "Moderate-calorie: Balanced nutritional content. Enjoy in moderation as part of a well-rounded diet."
+                parts.append(ADVICE_MODERATE_BALANCED)
             else:
-                advice = "Moderate-calorie: Consider optimizing your nutritional balance."
+                parts.append(ADVICE_MODERATE_UNBALANCED)
                 if self.page_fat < 10:
-                    advice += " Increase healthy fats for sustained energy."
+                    parts.append(ADVICE_LOW_FAT)
                 elif self.page_fat > 20:
-                    advice += " Limit saturated fats for heart health."
+                    parts.append(ADVICE_HIGH_FAT)
                 if self.page_protein < 5:
-                    advice += " Include more protein sources for muscle maintenance."
+                    parts.append(ADVICE_LOW_PROTEIN)
                 if self.page_sugar > 10:
-                    advice += " Be mindful of added sugars for overall well-being."
+                    parts.append(ADVICE_HIGH_SUGAR)
                 if not self.serving_size_check:
-                    advice += f"\nBe mindful of {self.mindful_food}. Small amount occasionally can be okay, but try to focus on a balanced diet overall."
+                    parts.append(ADVICE_MINDFUL.format(self.mindful_food))
         else:
-            advice += "High-calorie: Consider consuming in moderation. Check nutritional values for a balanced and varied diet."
+            parts.append(ADVICE_HIGH_CALORIE)
             if not self.serving_size_check:
-                advice += f"\nBe mindful of {self.mindful_food}. Small amount occasionally can be okay, but try to focus on a balanced diet overall."
+                parts.append(ADVICE_MINDFUL.format(self.mindful_food))
     
-        return advice
+        return ''.join(parts)
         
     def save_unsave(self) -> str:
         '''
@@ -556,7 +751,10 @@ class Pagination:
         - `mode` (str): The mode of pagination (exercise or nutrition).
         '''
         self.data = data
-        self.total_pages = len(self.data) // self.page_size + (len(self.data) % self.page_size > 0) # True evaluates as 1 and False as 0
+        self.data_json: Dict[str, str] = {}  # Serialized exercises, so saving one again reuses its JSON.
+        self.total_pages = -(-len(self.data) // self.page_size) # Ceiling division
+        # Split the data into pages once, so changing page is just an index lookup.
+        self.pages = [self.data[i:i + self.page_size] for i in range(0, len(self.data), self.page_size)]
         self.current_page = 1
         self.mode = mode
         self.display_page()
@@ -578,17 +776,19 @@ class Pagination:
                 else:
                     print("\nPrevious page doesn't exist.")
             elif user_input.lower() == 's' and self.mode == 'exercise' and self.display_data:
-                if self.user_data.is_saved(self.display_data['name']):
-                    print("\nThis exercise is already saved. Great choice!")
-                else:
-                    self.user_data.add_save(self.display_data['name'], self.display_data)
+                name = self.display_data['name']
+                if name not in self.data_json:
+                    self.data_json[name] = json.dumps(self.display_data)
+                # The insert itself reports whether the exercise was already saved.
+                if self.user_data.add_save(name, self.data_json[name]):
                     print("\nExercise has been saved. Keep up the good work!")
-            elif user_input.lower() == 'u' and self.mode == 'exercise' and self.display_data:
-                if not self.user_data.is_saved(self.display_data['name']):
-                    print("\nThis exercise is not saved. Keep track of your progress!")
                 else:
-                    self.user_data.delete_save(self.display_data['name'])
+                    print("\nThis exercise is already saved. Great choice!")
+            elif user_input.lower() == 'u' and self.mode == 'exercise' and self.display_data:
+                if self.user_data.delete_save(self.display_data['name']):
                     print("\nExercise has been unsaved. Adjusting your routine, I see!")
+                else:
+                    print("\nThis exercise is not saved. Keep track of your progress!")
             elif user_input.lower() == 'e' and self.mode == 'nutrition' and self.display_data:
                 if self.current_page not in self.eaten_pages:
                     consumed_calories = self.page_calories
@@ -606,7 +806,63 @@ class Pagination:
             else:
                 print("\nInvalid input. Let's stay on track!")
 
-def select_option(header: str, options: Dict[int, str]) -> str:
+# Menu headers. \033[3m highlights text and \033[0m resets it.
+ITALIC, RESET = "\033[3m", "\033[0m"
+MAIN_HEADER_SUFFIX = f"\n{ITALIC}SmokiFit── MAIN MENU {RESET}"
+SETTINGS_HEADER = f"\n{ITALIC}SmokiFit── SETTINGS {RESET}"
+TRACKER_HEADER_SUFFIX = f"\n{ITALIC}SmokiFit─ CALORIES TRACKER {RESET}"
+
+# Menu options, numbered as shown to the user.
+MAIN_OPTIONS = {
+    1: 'Search Exercise - Guided',
+    2: 'Search Exercise - Named',
+    3: 'Search Nutrition of Food',
+    4: 'Calories Tracker',
+    5: 'View Saved Exercises',
+    6: 'View Nutrition History',
+    7: 'Settings',
+    8: 'Exit'
+}
+SETTINGS_OPTIONS = {
+    1: 'Change API Key',
+    2: 'Configure Page Size',
+    3: 'Remove All Saves',
+    4: 'Clear History',
+    5: 'Back to Main Menu'
+}
+CALORIES_OPTIONS = {
+    1: 'Calorie Intake Calculator',
+    2: 'View Tracker History',
+    3: 'Change Calories Intake Goal',
+    4: 'Add Daily Calories',
+    5: 'Subtract Daily Calories',
+    6: 'Back to Main Menu'
+}
+
+# Harris-Benedict coefficients per gender: (base, weight, height, age).
+BMR_COEFFICIENTS = {
+    'Male': (88.362, 13.397, 4.799, -5.677),
+    'Female': (447.593, 9.247, 3.098, -4.330)
+}
+# Activity level multipliers applied to the BMR.
+ACTIVITY_FACTORS = {
+    'Sedentary (little or no exercise)': 1.2,
+    'Lightly active (1-3 days/week)': 1.375,
+    'Moderately active (3-5 days/week)': 1.55,
+    'Very active (6-7 days/week)': 1.725,
+    'Extremely active (hard exercise & physical job or 2x training)': 1.9
+}
+# Built once so the activity prompt doesn't rebuild them on every attempt.
+ACTIVITY_ITEMS = tuple(ACTIVITY_FACTORS.items())
+ACTIVITY_VALUES = tuple(ACTIVITY_FACTORS.values())
+# Accepted answers to the calorie calculator's offer to update the goal: (reply, whether to set the goal).
+# The reply is formatted with the suggested goal.
+GOAL_UPDATE_REPLIES = {
+    'y': ("\nGreat! Your daily calories goal has been changed to {} kcal.", True),
+    'n': ("\nNo problem! You can always adjust your daily calories goal later.", False)
+}
+
+def select_option(header: str, options: Dict[int, str]) -> int:
     '''
     Displays a menu with numbered options and prompts the user to choose an option.
 
@@ -615,7 +871,7 @@ def select_option(header: str, options: Dict[int, str]) -> str:
     - options (dict): A dictionary containing numbered options.
 
     Returns:
-    - str: The selected option.
+    - int: The number of the selected option.
     '''
     while True:
         try:
@@ -623,9 +879,8 @@ def select_option(header: str, options: Dict[int, str]) -> str:
             for key, value in options.items():
                 print(f"{key}. {value}")
             x = int(input("Choose an option: "))
-            selected_option = options.get(x)
-            if selected_option:
-                return selected_option
+            if x in options:
+                return x
             else:
                 print("\nPlease choose a correct option.")
         except ValueError:
@@ -658,7 +913,7 @@ def guided_search() -> None:
         11: 'Triceps'
     }
     header = "\nSELECT DIFFICULTY"
-    difficulty = select_option(header, difficulty_options)
+    difficulty = difficulty_options[select_option(header, difficulty_options)]
     smoki.difficulty = difficulty
 
     print("\nDo you want to search by 'type' or 'muscle'?")
@@ -667,12 +922,12 @@ def guided_search() -> None:
          choice = input("Enter 'type' or 'muscle': ").lower()
          if choice == 'type':
              header = "\nSELECT TYPE"
-             type = select_option(header, type_options)
+             type = type_options[select_option(header, type_options)]
              smoki.type = type
              break
          elif choice == 'muscle':
              header = "\nSELECT MUSCLE"
-             muscle = select_option(header, muscle_options)
+             muscle = muscle_options[select_option(header, muscle_options)]
              smoki.muscle = muscle
              break
          else:
@@ -710,11 +965,8 @@ def calorie_calc() -> None:
         Returns:
         The calculated BMR.
         '''
-        if gender == 'Male':
-            bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
-        elif gender == 'Female':
-            bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
-        return bmr
+        base, weight_factor, height_factor, age_factor = BMR_COEFFICIENTS[gender]
+        return base + (weight_factor * weight) + (height_factor * height) + (age_factor * age)
             
     gender_options = {
         1: 'Male',
@@ -725,15 +977,8 @@ def calorie_calc() -> None:
         2: 'Lose',
         3: 'Maintain'
     }
-    activity_factors = {
-        'Sedentary (little or no exercise)': 1.2,
-        'Lightly active (1-3 days/week)': 1.375,
-        'Moderately active (3-5 days/week)': 1.55,
-        'Very active (6-7 days/week)': 1.725,
-        'Extremely active (hard exercise & physical job or 2x training)': 1.9
-    }
     header = "\nSELECT GENDER"
-    gender = select_option(header, gender_options)
+    gender = gender_options[select_option(header, gender_options)]
     age = get_input("\nEnter your age: ", int)
     weight = get_input("\nEnter your weight in kg: ", float)
     height = get_input("\nEnter your height in cm: ", float)
@@ -742,12 +987,12 @@ def calorie_calc() -> None:
     while True:
         try:
             print("\nSELECT ACTIVITY LEVEL")
-            for i, (activity, factor) in enumerate(activity_factors.items(), 1):
+            for i, (activity, factor) in enumerate(ACTIVITY_ITEMS, 1):
                 print(f"{i}. {activity}")
         
             x = int(input("Choose an option: "))
-            if 1 <= x <= len(activity_factors):
-                activity_factor = list(activity_factors.values())[x - 1]
+            if 1 <= x <= len(ACTIVITY_VALUES):
+                activity_factor = ACTIVITY_VALUES[x - 1]
                 break
             else:
                 print("\nPlease choose a correct option.")
@@ -757,7 +1002,7 @@ def calorie_calc() -> None:
     daily_calories = round(bmr * activity_factor)
     suggestion = f"Your estimated daily calories need is {daily_calories}."
     header = "\nSELECT WEIGHT GOAL"
-    weight_goal = select_option(header, weight_goals)
+    weight_goal = weight_goals[select_option(header, weight_goals)]
     if weight_goal == 'Gain':
         daily_calories += 500
         suggestion += f"\nTo gain weight, aim for a daily caloric intake of approximately {daily_calories} kcal."
@@ -768,156 +1013,168 @@ def calorie_calc() -> None:
         suggestion += "\nYour calculated calorie needs are suitable for maintaining your current weight. Consume calories around this amount to stay in balance."
     print(suggestion)
     while True:
-        update_goal = input(f"\nWould you like to set {daily_calories} kcal as your daily calories goal? (y/n): ").lower()
-        if update_goal == 'y':
-            user_data.config_calories_goal(daily_calories)
-            print(f"\nGreat! Your daily calories goal has been changed to {daily_calories} kcal.")
+        update_goal = input(f"\nWould you like to set {daily_calories} kcal as your daily calories goal? (y/n): ").strip().lower()
+        if update_goal in GOAL_UPDATE_REPLIES:
+            reply, set_goal = GOAL_UPDATE_REPLIES[update_goal]
+            if set_goal:
+                user_data.config_calories_goal(daily_calories)
+                reply = reply.format(daily_calories)
+            print(reply)
             break
-        elif update_goal == 'n':
-            print("\nNo problem! You can always adjust your daily calories goal later.")
+        print("\nInvalid input. Please enter 'y' or 'n'.")
+
+def show_tracker_history() -> None:
+    '''Displays the daily calories consumption and goal history.'''
+    history = user_data.tracker_history()
+    print("\nLast 7 days history:")
+    # The < character is a formatting option that aligns the content to the left within the specified width.
+    print(f"{'Date': <13}{'Consumed (kcal)': <17}Goal (kcal)")
+    # Build the whole table first so it is written in one call.
+    sys.stdout.write("".join(f"{entry[0]: <13}{entry[1]: <17}{entry[2]}\n" for entry in history))
+
+def change_calories_goal() -> None:
+    '''Prompts the user for a new daily calories intake goal and sets it.'''
+    new_goal = get_input("\nEnter your new daily calories intake goal: ", int)
+    user_data.config_calories_goal(new_goal)
+    print(f"\nGreat! Your daily calories goal has been changed to {new_goal} kcal.")
+
+def adjust_daily_calories(sign: int) -> None:
+    '''
+    Prompts the user for calories and adds them to or subtracts them from the daily intake.
+
+    Args:
+    - sign (int): 1 to add the entered calories, -1 to subtract them.
+    '''
+    action, result = ('add', 'added to') if sign > 0 else ('subtract', 'subtracted from')
+    while True:
+        try:
+            value = int(input(f"\nEnter how many calories to {action}: "))
+            user_data.track_consumed_calories(sign * value)
+            print(f"\nGot it, {value} calories {result} daily intake.")
             break
-        else:
-            print("\nInvalid input. Please enter 'y' or 'n'.")
+        except ValueError:
+            print("\nSilly you, calories should be in number.")
 
 def calories_tracker_menu() -> None:
     '''Displays options related to the calories tracker and handles user input accordingly.'''
-    while True:
-        options = {
-            1: 'Calorie Intake Calculator',
-            2: 'View Tracker History',
-            3: 'Change Calories Intake Goal',
-            4: 'Add Daily Calories',
-            5: 'Subtract Daily Calories',
-            6: 'Back to Main Menu'
-        }
-        header = f"{user_data.calories_counter()}\n\033[3mSmokiFit─ CALORIES TRACKER \033[0m"
-        choice = select_option(header, options)
-        if choice == 'Calorie Intake Calculator':
-            calorie_calc()
-        elif choice == 'View Tracker History':
-            history = user_data.tracker_history()
-            print("\nLast 7 days history:")
-            # The < character is a formatting option that aligns the content to the left within the specified width.
-            print(f"{'Date': <13}{'Consumed (kcal)': <17}Goal (kcal)")
-            for entry in history:
-                print(f"{entry[0]: <13}{entry[1]: <17}{entry[2]}")
-        elif choice == 'Change Calories Intake Goal':
-            new_goal = get_input("\nEnter your new daily calories intake goal: ", int)
-            user_data.config_calories_goal(new_goal)
-            print(f"\nGreat! Your daily calories goal has been changed to {new_goal} kcal.")
-        elif choice == 'Add Daily Calories':
-            while True:
-                try:
-                    value = int(input("\nEnter how many calories to add: "))
-                    user_data.track_consumed_calories(value)
-                    print(f"\nGot it, {value} calories added to daily intake.")
-                    break
-                except ValueError:
-                    print("\nSilly you, calories should be in number.")
-        elif choice == 'Subtract Daily Calories':
-            while True:
-                try:
-                    value = int(input("\nEnter how many calories to subtract: "))
-                    user_data.track_consumed_calories(0-value)
-                    print(f"\nGot it, {value} calories subtracted from daily intake.")
-                    break
-                except ValueError:
-                    print("\nSilly you, calories should be in number.")
-        elif choice == 'Back to Main Menu':
-            break
+    # Each option number maps straight to its handler, None meaning back to the main menu.
+    dispatch = {
+        1: calorie_calc,
+        2: show_tracker_history,
+        3: change_calories_goal,
+        4: lambda: adjust_daily_calories(1),
+        5: lambda: adjust_daily_calories(-1),
+        6: None
+    }
+    # Group every change made in this menu into one transaction, committed once when leaving it, even on Ctrl-C.
+    # The handlers must therefore not use transaction() themselves, as a nested BEGIN would fail.
+    with user_data.transaction(commit_on_interrupt=True):
+        while True:
+            header = user_data.calories_counter() + TRACKER_HEADER_SUFFIX
+            handler = dispatch[select_option(header, CALORIES_OPTIONS)]
+            if handler is None:
+                break
+            handler()
+
+def change_api_key() -> None:
+    '''Prompts the user for a new API key and sets it.'''
+    print("\nFree API key at \033[4mhttps://api-ninjas.com\033[0m.")
+    smoki.key = smoki.ask_for_key()
     
 def settings_menu() -> None:
     '''Displays the settings menu and handle user interactions.'''
+    dispatch = {
+        1: change_api_key,
+        2: paginator.set_page_size,
+        3: user_data.remove_all_saves,
+        4: user_data.clear_history,
+        5: None
+    }
     while True:
-        settings_options = {
-            1: 'Change API Key',
-            2: 'Configure Page Size',
-            3: 'Remove All Saves',
-            4: 'Clear History',
-            5: 'Back to Main Menu'
-        }
-        header = "\n\033[3mSmokiFit── SETTINGS \033[0m"
-        choice = select_option(header, settings_options)
-
-        if choice == 'Change API Key':
-            print("\nFree API key at \033[4mhttps://api-ninjas.com\033[0m.")
-            smoki.key = smoki.ask_for_key()
-        elif choice == 'Configure Page Size':
-            paginator.set_page_size()
-        elif choice == 'Remove All Saves':
-            user_data.remove_all_saves()
-        elif choice == 'Clear History':
-            user_data.clear_history()
-        elif choice == 'Back to Main Menu':
+        handler = dispatch[select_option(SETTINGS_HEADER, SETTINGS_OPTIONS)]
+        if handler is None:
             break
+        handler()
+
+def show_search_results() -> None:
+    '''Retrieves the data for the current search and paginates through it.'''
+    data = smoki.get_data()
+    # Nothing to show if the request failed.
+    if data is None:
+        return
+    mode = smoki.mode
+    if mode == 'nutrition':
+        if data:
+            user_data.add_history(data)
+
+    paginator.paginate(data, mode)
+
+def search_exercise_guided() -> None:
+    '''Searches exercises by guided selection of difficulty, type or muscle.'''
+    smoki.mode = 'exercise'
+    guided_search()
+    show_search_results()
+
+def search_exercise_named() -> None:
+    '''Searches exercises by name.'''
+    smoki.mode = 'exercise'
+    name = input("\nEnter name of exercise to search: ")
+    smoki.name = name
+    show_search_results()
+
+def search_nutrition() -> None:
+    '''Searches nutrition information of one or more foods.'''
+    smoki.mode = 'nutrition'
+    print("\nTip: You can enter serving sizes and search multiple foods using commas or ‘and’ between names.")
+    food = input("\nEnter name of food: ")
+    # Collect every food entered so they can be looked up in a single request.
+    smoki.food = [item.strip() for item in food.split(',') if item.strip()]
+    show_search_results()
+
+def view_saved_exercises() -> None:
+    '''Paginates through the saved exercises.'''
+    saved = user_data.get_saves()
+    paginator.paginate(saved, 'exercise')
+
+def view_nutrition_history() -> None:
+    '''Paginates through the food search history.'''
+    history = user_data.get_history()
+    paginator.paginate(history, 'nutrition')
 
 def main_menu() -> None:
     '''Displays the main menu with various options and handles user input accordingly.'''
-    def main() -> None:
-        '''The main function orchestrating the user interaction with the fitness guide.'''
-        data = json.loads(smoki.get_data())
-        mode = smoki.mode
-        if mode == 'nutrition':
-            if data:
-                user_data.add_history(data)
-
-        paginator.paginate(data, mode)
-        
+    dispatch = {
+        1: search_exercise_guided,
+        2: search_exercise_named,
+        3: search_nutrition,
+        4: calories_tracker_menu,
+        5: view_saved_exercises,
+        6: view_nutrition_history,
+        7: settings_menu,
+        8: None
+    }
     while True:
-        main_options = {
-            1: 'Search Exercise - Guided',
-            2: 'Search Exercise - Named',
-            3: 'Search Nutrition of Food',
-            4: 'Calories Tracker',
-            5: 'View Saved Exercises',
-            6: 'View Nutrition History',
-            7: 'Settings',
-            8: 'Exit'
-        }
-        # \033[3m highlights text and \033[0m resets it.
-        header = f"{user_data.calories_counter()}\n\033[3mSmokiFit── MAIN MENU \033[0m"
-        choice = select_option(header, main_options)
-
-        if choice == 'Search Exercise - Guided':
-            smoki.mode = 'exercise'
-            guided_search()
-            main()
-        elif choice == 'Search Exercise - Named':
-            smoki.mode = 'exercise'
-            name = input("\nEnter name of exercise to search: ")
-            smoki.name = name
-            main()
-        elif choice == 'Search Nutrition of Food':
-            smoki.mode = 'nutrition'
-            print("\nTip: You can enter serving sizes and search multiple foods using ‘and’ between names.")
-            food = input("\nEnter name of food: ")
-            smoki.food = food
-            main()
-        elif choice == 'Calories Tracker':
-            calories_tracker_menu()
-        elif choice == 'View Saved Exercises':
-            saved = user_data.get_saves()
-            paginator.paginate(saved, 'exercise')
-        elif choice == 'View Nutrition History':
-            history = user_data.get_history()
-            paginator.paginate(history, 'nutrition')
-        elif choice == 'Settings':
-            settings_menu()
-        elif choice == 'Exit':
+        header = user_data.calories_counter() + MAIN_HEADER_SUFFIX
+        handler = dispatch[select_option(header, MAIN_OPTIONS)]
+        if handler is None:
             print('\nBye bro. See you again.')
             break
+        handler()
         
+# UserData is created first so the Trainer can share its database as an API response cache.
+user_data = UserData()
 # Try to instantiate a Trainer object.
 try:
-    smoki = Trainer()
-# Handle a ConnectionError, which might occur if there is no internet connection.
-except requests.exceptions.ConnectionError:
+    smoki = Trainer(user_data)
+# Handle any request failure, such as a ConnectionError or a timeout, which might occur if there is no internet connection.
+except requests.exceptions.RequestException:
     print("Please make sure you have an active internet connection.")
 # If no exception occurred, proceed with the following actions.
 else:
-    user_data = UserData()
-    paginator = Pagination(user_data)
+    user_data.load_goal()
+    paginator = Pagination(user_data, smoki)
     main_menu()
-    user_data.cursor.close()
-    user_data.conn.close()
+user_data.cursor.close()
+user_data.json_cursor.close()
+user_data.conn.close()
   